@@ -0,0 +1,22 @@
+# gunicorn_conf.py
+# Usage: gunicorn -c gunicorn_conf.py main:app
+import os
+
+# Behind nginx, point this at a Unix socket, e.g. GUNICORN_BIND=unix:/run/l1/gunicorn.sock
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+
+# Threaded workers: each process serves requests from a pool of real OS threads.
+# gevent/eventlet are deliberately not used: they monkey-patch threading, which would
+# turn the applicant writer and upload pool in main.py into greenlets, and blocking
+# SQLite waits and disk copies would then stall every connection in the worker.
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', (os.cpu_count() or 1) * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+worker_connections = 1000
+
+# Keep client connections open instead of piling up sockets in TIME_WAIT
+keepalive = 30
+timeout = 60
+
+accesslog = '-'
+errorlog = '-'
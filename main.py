@@ -1,10 +1,26 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, send_from_directory
+from flask import Flask, render_template, request, redirect, url_for, flash, send_from_directory, g, make_response
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError, StatementError
+from sqlalchemy.schema import CreateIndex
 import os
+import re
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 from urllib.parse import urlencode
 import logging
+import queue
+import threading
+import atexit
+import io
+import shutil
+import uuid
+import mimetypes
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
+from functools import lru_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -16,8 +32,81 @@ app.secret_key = 'supersecretkey'
 # --- File upload setup ---
 UPLOAD_FOLDER = os.path.join("uploads")
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+UPLOAD_FOLDER_EXISTS = os.path.isdir(UPLOAD_FOLDER)  # checked once; the folder doesn't move
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
+# Internal nginx location for uploads (e.g. '/internal-uploads/'); unset serves files from Flask
+app.config['UPLOADS_ACCEL_PREFIX'] = os.environ.get('UPLOADS_ACCEL_PREFIX')
+# Apache mod_xsendfile: lets send_from_directory emit X-Sendfile instead of streaming.
+# Flask applies this regardless of debug, so it is only enabled outside debug mode.
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1' and not app.debug
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Stored resumes are "<uuid hex>_<secure name>" so uploads can't overwrite each other
+STORED_UPLOAD_RE = re.compile(r'[0-9a-f]{32}_[A-Za-z0-9_.-]+')
+
+
+def unique_upload_name(filename):
+    """Returns the server-side name for an uploaded resume"""
+    return f"{uuid.uuid4().hex}_{filename}"
+
+# Resumes are written to disk off the request thread. This relies on real OS
+# threads: under gevent's monkey-patching the copies would just run later on the
+# same event loop, which is why gunicorn_conf.py uses gthread workers.
+upload_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="upload-writer")
+
+
+def _sendfile_copy(stream, out):
+    """
+    Copy a disk-backed stream with os.sendfile so the bytes stay in the kernel.
+    Returns False if the stream has no real file descriptor (e.g. in-memory).
+    """
+    if not hasattr(os, 'sendfile'):
+        return False
+    # SpooledTemporaryFile.fileno() forces a rollover to disk, so only use it once
+    # the file has already rolled over. `_rolled` is a private attribute of
+    # tempfile.SpooledTemporaryFile; plain file objects don't have it.
+    if not getattr(stream, '_rolled', True):
+        return False
+    raw = stream
+    try:
+        src_fd = raw.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return False
+    size = os.fstat(src_fd).st_size
+    offset = 0
+    try:
+        while offset < size:
+            sent = os.sendfile(out.fileno(), src_fd, offset, size - offset)
+            if not sent:
+                break
+            offset += sent
+    except OSError:
+        # Platforms without file-to-file sendfile
+        if offset:
+            raise
+        return False
+    return True
+
+
+def _persist_upload(stream, file_path):
+    """Copy a detached upload stream to its final path, then close it"""
+    part_path = file_path + '.part'
+    try:
+        stream.seek(0)
+        with open(part_path, 'wb') as out:
+            if not _sendfile_copy(stream, out):
+                shutil.copyfileobj(stream, out, UPLOAD_CHUNK_SIZE)
+        os.replace(part_path, file_path)
+        logger.info(f"✅ File saved: {os.path.basename(file_path)}")
+    except Exception as e:
+        logger.error(f"❌ Error saving file {os.path.basename(file_path)}: {e}")
+        if os.path.exists(part_path):
+            os.remove(part_path)
+    finally:
+        stream.close()
+
+# User-Agent fragments that mark a submission as automated
+BOT_USER_AGENT_RE = re.compile(r'python|requests|curl|wget|httpx|bot|crawl|spider', re.IGNORECASE)
 
 # --- Database setup ---
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -29,6 +118,25 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 db = SQLAlchemy(app)
 
+# --- SQLite tuning ---
+# WAL lets readers run alongside the writer; NORMAL sync drops an fsync per commit.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-64000",
+    "busy_timeout=5000",
+)
+
+with app.app_context():
+    @event.listens_for(db.engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _):
+        cur = dbapi_conn.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cur.execute(f"PRAGMA {pragma}")
+        cur.close()
+
 # --- Database Model ---
 class Applicant(db.Model):
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -42,10 +150,25 @@ class Applicant(db.Model):
     position = db.Column(db.String(100))
     additional_info = db.Column(db.Text)
     resume_filename = db.Column(db.String(255))
-    submitted_at = db.Column(db.DateTime, server_default=db.func.now())
-    source = db.Column(db.String(50), default='direct')  # 'direct' or 'bot'
+    submitted_at = db.Column(db.DateTime, server_default=db.func.now(), index=True)
+    source = db.Column(db.String(50), default='direct')  # 'direct' or 'bot'; indexed via ix_applicant_src_sub
     ip_address = db.Column(db.String(50))
 
+    __table_args__ = (db.Index('ix_applicant_src_sub', 'source', 'submitted_at'),)
+
+
+# Insert statement and form-backed columns, built once for every write path
+APPLICANT_INSERT = Applicant.__table__.insert()
+APPLICANT_FORM_FIELDS = ('first_name', 'last_name', 'email', 'phone', 'country',
+                         'city', 'address', 'position', 'additional_info')
+
+
+def applicant_row_from_form(form, resume_filename, source, ip_address):
+    """Build an insert row from submitted form data"""
+    row = {field: form.get(field) for field in APPLICANT_FORM_FIELDS}
+    row.update(resume_filename=resume_filename, source=source, ip_address=ip_address)
+    return row
+
 # --- Database Migration Function ---
 def migrate_database():
     """Drop and recreate database with new schema"""
@@ -59,48 +182,240 @@ def migrate_database():
         db.create_all()
         logger.info("✅ Database created with new schema")
 
+# Every column a bulk import may set; submitted_at is filled in by the database
+APPLICANT_IMPORT_COLUMNS = APPLICANT_FORM_FIELDS + ('resume_filename', 'source', 'ip_address')
+
+
+class BulkInsertError(Exception):
+    """Raised when a bulk import fails part-way; `inserted` rows were already committed"""
+
+    def __init__(self, message, inserted):
+        super().__init__(message)
+        self.inserted = inserted
+
+
+def _import_row(row):
+    """
+    Give an import row the full column set. Core executemany needs identical
+    keys in every row, so missing optional columns become None ('direct' for source).
+    """
+    unknown = set(row) - set(APPLICANT_IMPORT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown applicant column(s): {', '.join(sorted(unknown))}")
+    normalized = dict.fromkeys(APPLICANT_IMPORT_COLUMNS)
+    normalized['source'] = 'direct'
+    normalized.update(row)
+    return normalized
+
+
+def bulk_add_applicants(rows, chunk_size=500):
+    """
+    Insert many applicant dicts (e.g. a CSV import) with Core executemany,
+    committing every chunk_size rows. Returns the number of rows inserted.
+    On failure the current chunk is rolled back and BulkInsertError reports
+    how many rows were committed before it.
+    """
+    rows = iter(rows)
+    inserted = 0
+    while True:
+        try:
+            batch = [_import_row(row) for row in islice(rows, chunk_size)]
+            if not batch:
+                break
+            db.session.execute(APPLICANT_INSERT, batch)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"❌ Bulk insert failed after {inserted} applicant(s): {e}")
+            raise BulkInsertError(f"Bulk insert failed after {inserted} applicant(s): {e}", inserted) from e
+        inserted += len(batch)
+    logger.info(f"✅ Bulk inserted {inserted} applicant(s)")
+    return inserted
+
+L1_BASE_URL = "https://application.taskifyjobs.com/submit"
+
+
+@lru_cache(maxsize=1024)
+def _encode_params(items):
+    """urlencode a sorted tuple of (key, value) pairs, memoized per combination"""
+    return urlencode(items)
+
+
 def redirect_to_l1_with_params():
     """Redirect to L1 while preserving all UTM parameters"""
-    preserved_params = get_preserved_params()
-    l1_base_url = "https://application.taskifyjobs.com/submit"
+    items = tuple(sorted(get_preserved_params().items()))
 
-    if preserved_params:
-        query_string = urlencode(preserved_params)
-        return f"{l1_base_url}?{query_string}"
+    if items:
+        return f"{L1_BASE_URL}?{_encode_params(items)}"
     else:
-        return l1_base_url
+        return L1_BASE_URL
 with app.app_context():
     db.create_all()  # Only create tables if they don't exist
+    # create_all() skips indexes on tables that already exist; IF NOT EXISTS keeps
+    # concurrent worker boots from racing on the same index
+    with db.engine.begin() as conn:
+        for index in Applicant.__table__.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
     logger.info(f"✅ L1 connected to database: {DB_PATH}")
 
+# --- Background applicant writer ---
+# Submissions are queued as plain dicts and inserted in batches by a single
+# writer thread, so requests never wait on SQLite's write lock.
+WRITE_BATCH_SIZE = 200
+WRITE_QUEUE_MAXSIZE = 10000  # index() reports a failure instead of queueing past this
+WRITE_BACKOFF_MAX = 30  # seconds between retries while the database stays locked
+write_queue = queue.Queue(maxsize=WRITE_QUEUE_MAXSIZE)
+_WRITER_STOP = object()
+
+
+def _insert_rows(rows):
+    """
+    Insert rows in one transaction. While SQLite reports the database locked
+    (OperationalError) the whole batch is kept and retried with backoff;
+    any other error is raised to the caller.
+    """
+    delay = 0.5
+    while True:
+        try:
+            db.session.execute(APPLICANT_INSERT, rows)
+            db.session.commit()
+            return
+        except OperationalError as e:
+            db.session.rollback()
+            logger.warning(f"⚠️ Database busy saving {len(rows)} applicant(s), retrying in {delay}s: {e.orig}")
+            time.sleep(delay)
+            delay = min(delay * 2, WRITE_BACKOFF_MAX)
+        except Exception:
+            db.session.rollback()
+            raise
+
+
+def _flush_rows(rows):
+    """
+    Insert a batch of applicant rows in one transaction. If a row-specific
+    error (e.g. IntegrityError) fails the batch, fall back to one row at a
+    time so a single bad row can't drop the rest.
+    """
+    try:
+        _insert_rows(rows)
+        logger.info(f"✅ Saved {len(rows)} applicant(s) to database")
+        return
+    except StatementError as e:
+        if len(rows) == 1:
+            logger.error(f"❌ Error saving applicant {rows[0].get('email')}: {e}")
+            return
+        logger.warning(f"⚠️ Batch of {len(rows)} applicant(s) failed, saving one at a time: {e}")
+    except Exception as e:
+        logger.error(f"❌ Error saving {len(rows)} applicant(s): {e}")
+        return
+
+    saved = 0
+    for row in rows:
+        try:
+            _insert_rows([row])
+            saved += 1
+        except Exception as e:
+            logger.error(f"❌ Error saving applicant {row.get('email')}: {e}")
+    logger.info(f"✅ Saved {saved} of {len(rows)} applicant(s) to database")
+
+
+def _drain_writer():
+    """Drain the write queue, inserting up to WRITE_BATCH_SIZE rows at a time"""
+    with app.app_context():
+        while True:
+            rows = []
+            stop = False
+            item = write_queue.get()
+            while True:
+                if item is _WRITER_STOP:
+                    stop = True
+                    break
+                rows.append(item)
+                if len(rows) >= WRITE_BATCH_SIZE or write_queue.empty():
+                    break
+                item = write_queue.get_nowait()
+            if rows:
+                _flush_rows(rows)
+            db.session.remove()
+            if stop:
+                return
+
+
+_writer_thread = threading.Thread(target=_drain_writer, name="applicant-writer", daemon=True)
+_writer_thread.start()
+
+
+@atexit.register
+def _stop_writer():
+    """Flush any queued applicants before the process exits"""
+    try:
+        write_queue.put(_WRITER_STOP, timeout=10)
+    except queue.Full:
+        logger.error(f"❌ Write queue still full at exit, {write_queue.qsize()} applicant(s) unsaved")
+        return
+    _writer_thread.join(timeout=10)
+
 # --- Helper to preserve campaign/query params ---
 def preserve_params(default_url='/', extra_params=None):
     """
-    Returns a redirect URL that preserves gclid and utm_* parameters.
+    Returns a redirect URL that preserves gclid and the standard utm_* parameters.
     """
-    params = {}
     # Keep gclid & utm parameters
-    for key, value in request.args.items():
-        if key.startswith('utm_') or key == 'gclid':
-            params[key] = value
-    # Add any extra params
+    params = get_preserved_params()
+    # Add any extra params (merged into a copy so the cached dict isn't touched)
     if extra_params:
-        params.update(extra_params)
+        params = {**params, **extra_params}
     # Build URL
     if params:
-        return f"{default_url}?{urlencode(params)}"
+        return f"{default_url}?{_encode_params(tuple(sorted(params.items())))}"
     return default_url
 
 
+# Campaign parameters carried across pages and redirects
+PRESERVED_PARAMS = frozenset(('utm_source', 'utm_medium', 'utm_campaign',
+                              'utm_term', 'utm_content', 'utm_id', 'gclid'))
+
+
 def get_preserved_params():
     """
     Returns a dictionary of preserved parameters for use in templates.
+    Looked up once per request and cached on flask.g.
+    """
+    if '_preserved' not in g:
+        args = request.args
+        g._preserved = {key: args[key] for key in PRESERVED_PARAMS if key in args}
+    return g._preserved
+
+
+_index_url = None
+
+
+def redirect_to_index():
+    """
+    Redirect back to the application form, keeping campaign params.
+    The index URL is reversed once and reused.
     """
-    params = {}
-    for key, value in request.args.items():
-        if key.startswith('utm_') or key == 'gclid':
-            params[key] = value
-    return params
+    global _index_url
+    if _index_url is None:
+        _index_url = url_for('index')
+    return redirect(preserve_params(_index_url))
+
+
+# --- Static page rendering ---
+_STATIC_CACHE = {}
+
+
+def render_static(template_name):
+    """
+    Renders a static page. Pages without campaign params are rendered once
+    and served from memory afterwards.
+    """
+    preserved_params = get_preserved_params()
+    if preserved_params or app.debug:
+        return render_template(template_name, query_params=preserved_params)
+    if template_name not in _STATIC_CACHE:
+        _STATIC_CACHE[template_name] = render_template(template_name, query_params={})
+    return _STATIC_CACHE[template_name]
 
 
 # --- Routes ---
@@ -108,12 +423,12 @@ def get_preserved_params():
 def index():
     if request.method == 'POST':
         try:
-            # Log incoming request details
+            # Log incoming request details (full dump only at DEBUG)
             client_ip = request.environ.get('HTTP_X_REAL_IP', request.remote_addr)
-            logger.info(f"📥 POST request received from: {client_ip}")
-            logger.info(f"📦 Headers: {dict(request.headers)}")
-            logger.info(f"📦 Form data: {dict(request.form)}")
-            logger.info(f"📦 Files: {[f.filename for f in request.files.values()] if request.files else 'None'}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📦 Headers: %s Form keys: %s Files: %s",
+                             dict(request.headers), list(request.form.keys()),
+                             [f.filename for f in request.files.values()])
 
             form = request.form
             file = request.files.get('resume')
@@ -123,44 +438,43 @@ def index():
             for field in required_fields:
                 if not form.get(field):
                     flash(f"Missing required field: {field.replace('_', ' ').title()}", "error")
-                    return redirect(preserve_params(url_for('index')))
+                    return redirect_to_index()
 
             resume_filename = None
+            if not (file and file.filename) and form.get('resume_filename'):
+                # Resume already streamed to /upload by the frontend; only accept names it issued
+                uploaded_name = form.get('resume_filename')
+                if (STORED_UPLOAD_RE.fullmatch(uploaded_name)
+                        and os.path.exists(os.path.join(app.config['UPLOAD_FOLDER'], uploaded_name))):
+                    resume_filename = uploaded_name
             if file and file.filename:
                 if file.filename == '':
                     flash('No selected file', 'error')
-                    return redirect(preserve_params(url_for('index')))
+                    return redirect_to_index()
 
                 if file:
                     resume_filename = secure_filename(file.filename)
+                    if not resume_filename:
+                        flash('Invalid file name', 'error')
+                        return redirect_to_index()
+                    resume_filename = unique_upload_name(resume_filename)
                     file_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_filename)
-                    file.save(file_path)
-                    logger.info(f"✅ File saved: {resume_filename}")
+                    # Detach the spooled stream so request teardown doesn't close it
+                    stream, file.stream = file.stream, io.BytesIO()
+                    upload_pool.submit(_persist_upload, stream, file_path)
 
             # Determine source (direct or bot)
-            user_agent = request.headers.get('User-Agent', '').lower()
-            source = 'bot' if 'python' in user_agent or 'requests' in user_agent else 'direct'
-
-            # Save to DB
-            applicant = Applicant(
-                first_name=form.get('first_name'),
-                last_name=form.get('last_name'),
-                email=form.get('email'),
-                phone=form.get('phone'),
-                country=form.get('country'),
-                city=form.get('city'),
-                address=form.get('address'),
-                position=form.get('position'),
-                additional_info=form.get('additional_info'),
-                resume_filename=resume_filename,
-                source=source,
-                ip_address=client_ip
-            )
-            db.session.add(applicant)
-            db.session.commit()
-
-            logger.info(f"✅ Applicant saved to database with ID: {applicant.id}")
-            logger.info(f"✅ Source: {source}, Name: {applicant.first_name} {applicant.last_name}")
+            user_agent = request.headers.get('User-Agent', '')
+            source = 'bot' if BOT_USER_AGENT_RE.search(user_agent) else 'direct'
+            logger.info("📥 POST %s src=%s", client_ip, source)
+
+            # Queue for the background writer
+            try:
+                write_queue.put_nowait(applicant_row_from_form(form, resume_filename, source, client_ip))
+            except queue.Full:
+                logger.error(f"❌ Write queue full ({WRITE_QUEUE_MAXSIZE}), rejecting application from {client_ip}")
+                flash('We are receiving a lot of applications right now. Please try again shortly.', 'error')
+                return redirect_to_index()
 
             flash("Application submitted successfully!")
             l1_redirect_url = redirect_to_l1_with_params()
@@ -170,7 +484,7 @@ def index():
             logger.error(f"❌ Error processing application: {str(e)}")
             db.session.rollback()
             flash('Error submitting application. Please try again.', 'error')
-            return redirect(preserve_params(url_for('index')))
+            return redirect_to_index()
 
     preserved_params = get_preserved_params()
     return render_template('index.html', query_params=preserved_params)
@@ -179,70 +493,132 @@ def index():
 # --- Terms Pages ---
 @app.route('/terms/data-collection')
 def terms_data_collection():
-    preserved_params = get_preserved_params()
-    return render_template('terms_data_collection.html', query_params=preserved_params)
+    return render_static('terms_data_collection.html')
 
 
 @app.route('/terms/communication')
 def terms_communication():
-    preserved_params = get_preserved_params()
-    return render_template('terms_communication.html', query_params=preserved_params)
+    return render_static('terms_communication.html')
 
 
 @app.route('/terms/recruitment')
 def terms_recruitment():
-    preserved_params = get_preserved_params()
-    return render_template('terms_recruitment.html', query_params=preserved_params)
+    return render_static('terms_recruitment.html')
 
 
 # --- Privacy Page ---
 @app.route('/privacy')
 def privacy():
-    preserved_params = get_preserved_params()
-    return render_template('privacy.html', query_params=preserved_params)
+    return render_static('privacy.html')
 
 
 @app.route('/submit')
 def submit():
-    preserved_params = get_preserved_params()
-    return render_template('submit.html', query_params=preserved_params)
+    return render_static('submit.html')
+
+
+@app.route('/upload', methods=['POST', 'PUT'])
+def upload():
+    """Stream a raw resume body straight to disk, bypassing the multipart parser"""
+    filename = secure_filename(request.args.get('filename', ''))
+    if not filename:
+        return {'error': 'Missing filename'}, 400
+    if request.content_length and request.content_length > app.config['MAX_CONTENT_LENGTH']:
+        return {'error': 'File too large. Maximum size is 16MB.'}, 413
+
+    filename = unique_upload_name(filename)
+    file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    part_path = file_path + '.part'
+    try:
+        with open(part_path, 'wb') as f:
+            while True:
+                chunk = request.stream.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+        os.replace(part_path, file_path)
+    except Exception as e:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        # Oversized chunked body: answer in JSON rather than via the redirecting 413 handler
+        if isinstance(e, RequestEntityTooLarge):
+            return {'error': 'File too large. Maximum size is 16MB.'}, 413
+        if isinstance(e, HTTPException):
+            raise
+        logger.error(f"❌ Error streaming upload {filename}: {e}")
+        return {'error': 'Upload failed'}, 500
+
+    logger.info(f"✅ File streamed: {filename}")
+    return {'filename': filename}
 
 
 @app.route('/uploads/<filename>')
 def uploaded_file(filename):
+    accel_prefix = app.config['UPLOADS_ACCEL_PREFIX']
+    if accel_prefix and not app.debug:
+        # Let the reverse proxy sendfile() the resume instead of tying up a worker
+        filename = secure_filename(filename)
+        response = make_response('')
+        response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{filename}"
+        # Keep the real type so PDFs still open inline from the "View" links
+        response.headers['Content-Type'] = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        return response
     return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
 
 
+APPLICATIONS_PER_PAGE = 50
+
+
 @app.route('/applications')
 def applications():
     print(f"🔍 DEBUG: Accessing /applications route")
     print(f"🔍 DEBUG: Request args: {dict(request.args)}")
     print(f"🔍 DEBUG: Request endpoint: {request.endpoint}")
 
-    all_applicants = Applicant.query.order_by(Applicant.submitted_at.desc()).all()
+    page = request.args.get('page', 1, type=int)
+    pager = db.paginate(
+        db.select(Applicant).order_by(Applicant.submitted_at.desc()),
+        page=page, per_page=APPLICATIONS_PER_PAGE, error_out=False
+    )
     preserved_params = get_preserved_params()
 
     print(f"🔍 DEBUG: Preserved params: {preserved_params}")
-    print(f"🔍 DEBUG: Applicant count: {len(all_applicants)}")
+    print(f"🔍 DEBUG: Applicant count: {pager.total}")
 
     # Log access to applications page
-    logger.info(f"📊 Applications page accessed - Total applicants: {len(all_applicants)}")
+    logger.info(f"📊 Applications page accessed - Total applicants: {pager.total}, page {pager.page}")
+
+    return render_template('applications.html', applicants=pager.items, pager=pager, query_params=preserved_params)
+
+
+# Per-process "now" string, refreshed at most once a second
+_timestamp_cache = [0.0, '']
+
+
+def now_iso():
+    """Returns the current time as an ISO string with 1-second resolution"""
+    t = time.time()
+    if t - _timestamp_cache[0] >= 1.0:
+        _timestamp_cache[0] = t
+        _timestamp_cache[1] = datetime.fromtimestamp(t).isoformat()
+    return _timestamp_cache[1]
+
 
-    return render_template('applications.html', applicants=all_applicants, query_params=preserved_params)
 @app.route('/api/status')
 def api_status():
     """API endpoint to check application status"""
-    total_applicants = Applicant.query.count()
-    bot_submissions = Applicant.query.filter_by(source='bot').count()
-    direct_submissions = Applicant.query.filter_by(source='direct').count()
+    # One GROUP BY instead of a count per source
+    source_counts = dict(db.session.execute(
+        db.select(Applicant.source, db.func.count()).group_by(Applicant.source)
+    ).all())
 
     status_info = {
-        'total_applications': total_applicants,
-        'bot_submissions': bot_submissions,
-        'direct_submissions': direct_submissions,
+        'total_applications': sum(source_counts.values()),
+        'bot_submissions': source_counts.get('bot', 0),
+        'direct_submissions': source_counts.get('direct', 0),
         'database_path': DB_PATH,
-        'database_exists': os.path.exists(DB_PATH),
-        'timestamp': datetime.now().isoformat()
+        'database_exists': _db_health['available'],
+        'timestamp': now_iso()
     }
 
     return status_info
@@ -251,42 +627,63 @@ def api_status():
 @app.route('/api/debug')
 def api_debug():
     """Debug endpoint to see recent submissions"""
-    recent_applicants = Applicant.query.order_by(Applicant.submitted_at.desc()).limit(10).all()
+    # Column-level select: plain tuples, no ORM objects to hydrate
+    recent_rows = db.session.execute(
+        db.select(
+            Applicant.id, Applicant.first_name, Applicant.last_name, Applicant.email,
+            Applicant.source, Applicant.submitted_at,
+            db.func.coalesce(Applicant.resume_filename, '') != ''
+        ).order_by(Applicant.submitted_at.desc()).limit(10)
+    ).all()
 
     debug_info = {
         'recent_submissions': [
             {
-                'id': app.id,
-                'first_name': app.first_name,
-                'last_name': app.last_name,
-                'email': app.email,
-                'source': app.source,
-                'submitted_at': app.submitted_at.isoformat() if app.submitted_at else None,
-                'resume': bool(app.resume_filename)
+                'id': id_,
+                'first_name': first_name,
+                'last_name': last_name,
+                'email': email,
+                'source': source,
+                'submitted_at': submitted_at.isoformat() if submitted_at else None,
+                'resume': bool(has_resume)
             }
-            for app in recent_applicants
+            for id_, first_name, last_name, email, source, submitted_at, has_resume in recent_rows
         ],
-        'total_count': Applicant.query.count()
+        'total_count': db.session.scalar(db.select(db.func.count()).select_from(Applicant))
     }
 
     return debug_info
 
 
+# Cached database heartbeat so frequent probes don't hit SQLite every time
+HEALTH_CHECK_INTERVAL = 5
+# 'available' starts from the post-create_all() state and only changes with a ping
+_db_health = {'checked_at': 0.0, 'status': 'unknown', 'available': os.path.exists(DB_PATH)}
+
+
+def db_ping():
+    """Returns the database status, re-checking at most every HEALTH_CHECK_INTERVAL seconds"""
+    if time.time() - _db_health['checked_at'] > HEALTH_CHECK_INTERVAL:
+        try:
+            db.session.execute(text('SELECT 1'))
+            _db_health['status'] = 'healthy'
+            _db_health['available'] = True
+        except Exception as e:
+            db.session.rollback()
+            _db_health['status'] = f'error: {str(e)}'
+            _db_health['available'] = False
+        _db_health['checked_at'] = time.time()
+    return _db_health['status']
+
+
 @app.route('/health')
 def health():
     """Health check endpoint"""
-    try:
-        # Test database connection
-        db.session.execute('SELECT 1')
-        database_status = 'healthy'
-    except Exception as e:
-        database_status = f'error: {str(e)}'
-
     return {
         'status': 'ok',
-        'timestamp': datetime.now().isoformat(),
-        'database': database_status,
-        'upload_folder': os.path.exists(app.config['UPLOAD_FOLDER'])
+        'timestamp': now_iso(),
+        'database': db_ping(),
+        'upload_folder': UPLOAD_FOLDER_EXISTS
     }
 
 
@@ -294,7 +691,7 @@ def health():
 @app.errorhandler(413)
 def too_large(e):
     flash('File too large. Maximum size is 16MB.', 'error')
-    return redirect(preserve_params(url_for('index')))
+    return redirect_to_index()
 
 
 @app.errorhandler(500)
@@ -302,12 +699,17 @@ def internal_error(error):
     db.session.rollback()
     logger.error(f"❌ 500 Internal Server Error: {str(error)}")
     flash('An internal error occurred. Please try again.', 'error')
-    return redirect(preserve_params(url_for('index')))
+    return redirect_to_index()
 
 
 # --- Run App ---
+# Production runs under gunicorn (see gunicorn_conf.py); the dev server is opt-in.
 if __name__ == '__main__':
-    logger.info("🚀 Starting L1 Application Server...")
-    logger.info(f"📁 Upload folder: {os.path.abspath(app.config['UPLOAD_FOLDER'])}")
-    logger.info(f"📊 Database: {os.path.abspath(DB_PATH)}")
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    if os.environ.get('DEV'):
+        logger.info("🚀 Starting L1 Application Server...")
+        logger.info(f"📁 Upload folder: {os.path.abspath(app.config['UPLOAD_FOLDER'])}")
+        logger.info(f"📊 Database: {os.path.abspath(DB_PATH)}")
+        app.config['USE_X_SENDFILE'] = False
+        app.run(debug=True, host='0.0.0.0', port=5000)
+    else:
+        logger.warning("⚠️ Set DEV=1 for the dev server, or run: gunicorn -c gunicorn_conf.py main:app")
\ No newline at end of file